@@ -1,36 +1,214 @@
 # Import required modules
 import json  # For JSON file operations
-import os  # For file existence check
+import mmap  # For reading the contacts file without copying it
+import os  # For atomic replace, fsync and log cleanup
+import re  # For phone number digit matching
+import sys  # For reading menu input from stdin and interning field names
 from datetime import datetime  # For date/time tracking
 
+# orjson is optional; it reads and writes JSON much faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Matches a single digit; compiled once for validate_phone
+_DIGIT_RE = re.compile(r"\d")
+
+# The change log is folded into the contacts file once it has more entries
+# than there are contacts (and at least this many)
+_COMPACT_MIN_ENTRIES = 100
+
+
+def _parse_json(data):
+    """Parse JSON text or bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_line(obj):
+    """Serialize obj as one compact line of JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
 # Main Contact Book class
 class ContactBook:
-    # Initialize with filename and load existing contacts
-    def __init__(self, filename="contacts.json"):
+    # Column layout for list_all_contacts: name, phone, email
+    _ROW_FORMAT = "%-20s %-15s %-25s"
+    
+    # Initialize with filename; contacts are loaded on first use
+    def __init__(self, filename="contacts.json", pretty=False, verbose=True):
         self.filename = filename
-        self.contacts = self.load_contacts()
+        self.pretty = pretty  # Indent the JSON file for human readers
+        self.verbose = verbose  # Print success messages from saves and edits
+        self._contacts = None  # Not read from disk yet
+        self._changed = {}  # Stored names with unsaved changes, in order, for flush()
+        # Append-only log of changes made since the contacts file was last saved
+        self._log_filename = f"{filename}.log"
+        self._log_entries = 0
+        # One stdlib encoder reused for every save, and the last payload written
+        if pretty:
+            self._encoder = json.JSONEncoder(indent=4)
+        else:
+            self._encoder = json.JSONEncoder(separators=(",", ":"))
+        self._last_serialized = None  # Read from disk on the first save
+    
+    @property
+    def contacts(self):
+        """Contacts dict, read from the JSON file on first access"""
+        if self._contacts is None:
+            self._load()
+        return self._contacts
+    
+    @property
+    def _ci_index(self):
+        """Lowercased name -> stored name, for case-insensitive lookups"""
+        if self._contacts is None:
+            self._load()
+        return self._name_index
+    
+    def _load(self):
+        """Read the contacts file and change log, and build the lookup indexes"""
+        self._contacts = self.load_contacts()
+        self._replay_log()
+        self._name_index = {key.lower(): key for key in self._contacts}
+        # Stored name -> "name\0phone\0email" lowercased, in file order, so a
+        # query is matched against all three fields in one scan but never
+        # across a field boundary
+        self._haystack = {}
+        for key in self._contacts:
+            self._index_contact(key)
+    
+    def _index_contact(self, name):
+        """Add or refresh a stored contact's search haystack"""
+        details = self._contacts[name]
+        self._haystack[name] = f"{name}\0{details.get('phone', '')}\0{details.get('email', '')}".lower()
     
     def load_contacts(self):
         """Load contacts from JSON file"""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
+        # Just try to open the file; a separate existence check would cost
+        # an extra syscall and could race with the file being replaced
+        try:
+            with open(self.filename, 'rb') as f:
+                if orjson is None:
                     return json.load(f)
-            except json.JSONDecodeError:
-                print("Errorr reading contacts file. Starting with empty contact list.")
-                return {}
-        return {}
+                # orjson parses straight from the mapped pages, so the
+                # file is never copied into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+        except FileNotFoundError:
+            return {}
+        # JSONDecodeError is a ValueError, as is mapping an empty file
+        except ValueError:
+            print("Errorr reading contacts file. Starting with empty contact list.")
+            return {}
+    
+    def _replay_log(self):
+        """Apply change log entries written since the contacts file was saved"""
+        try:
+            with open(self._log_filename, 'rb') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        
+        good_bytes = 0
+        for line in lines:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete log line")
+                entry = _parse_json(line)
+            except ValueError:
+                # Torn last line from an interrupted write; cut it off so
+                # the next append starts on a clean line
+                os.truncate(self._log_filename, good_bytes)
+                break
+            # Each entry holds a contact's full state, or None once deleted
+            if entry["contact"] is None:
+                self._contacts.pop(entry["name"], None)
+            else:
+                # Each log line is parsed on its own, so its field names are
+                # fresh strings; intern them to share one copy across contacts
+                self._contacts[entry["name"]] = {
+                    sys.intern(field): value for field, value in entry["contact"].items()
+                }
+            self._log_entries += 1
+            good_bytes += len(line)
+    
+    def _append_log(self):
+        """Append the current state of each changed contact to the change log"""
+        lines = [
+            _dump_line({"name": name, "contact": self._contacts.get(name)})
+            for name in self._changed
+        ]
+        with open(self._log_filename, 'ab') as f:
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_entries += len(lines)
+        self._changed.clear()
     
     def save_contacts(self):
         """Save contacts to JSON file"""
-        with open(self.filename, 'w') as f:
-            json.dump(self.contacts, f, indent=4)
-        print("Contacts saved successfully!")
+        # Log pending changes first, so a crash before the log is removed
+        # below can never replay stale entries over the new file
+        if self._log_entries and self._changed:
+            self._append_log()
+        self._changed.clear()
+        
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if self.pretty else 0
+            payload = orjson.dumps(self.contacts, option=option)
+        else:
+            payload = self._encoder.encode(self.contacts).encode("utf-8")
+        
+        # On the first save of a session, compare against what is on disk
+        if self._last_serialized is None:
+            try:
+                with open(self.filename, 'rb') as f:
+                    self._last_serialized = f.read()
+            except FileNotFoundError:
+                pass
+        # Nothing to write if the file already holds this exact content
+        if payload != self._last_serialized:
+            # Write a temp file and swap it in, so a crash never leaves a torn file
+            tmp_filename = f"{self.filename}.tmp"
+            with open(tmp_filename, 'wb', buffering=1 << 16) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, self.filename)
+            self._last_serialized = payload
+            if self.verbose:
+                print("Contacts saved successfully!")
+        
+        # The contacts file now holds every change, so the log can go
+        if self._log_entries:
+            os.remove(self._log_filename)
+            self._log_entries = 0
+    
+    def flush(self):
+        """Append unsaved changes to the change log, compacting when it grows large"""
+        if not self._changed:
+            return
+        self._append_log()
+        if self._log_entries > max(len(self._contacts), _COMPACT_MIN_ENTRIES):
+            self.save_contacts()
+        else:
+            if self.verbose:
+                print("Contacts saved successfully!")
+    
+    def compact(self):
+        """Fold the change log into the contacts file"""
+        if self._log_entries or self._changed:
+            self.save_contacts()
     
     def add_contact(self, name, phone_number, email="", address=""):
         """Add a new contact"""
         # Check if contact already exists (case-insensitive)
-        if name.lower() in [c.lower() for c in self.contacts]:
+        if name.lower() in self._ci_index:
             print(f"Contact '{name}' already exists!")
             return False
         
@@ -44,20 +222,26 @@ class ContactBook:
             "phone": phone_number,
             "email": email,
             "address": address,
-            "date_added": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "date_added": datetime.now().isoformat(sep=" ", timespec="seconds")
         }
-        self.save_contacts()  # Save to file immediately
-        print(f"Contact '{name}' added successfully!")
+        self._ci_index[name.lower()] = name
+        self._index_contact(name)
+        self._changed[name] = None  # Saved on the next flush()
+        if self.verbose:
+            print(f"Contact '{name}' added successfully!")
         return True
     
+    def add_many(self, entries):
+        """Add several contacts and save once at the end"""
+        # Each entry is (name, phone_number[, email[, address]])
+        added = sum(1 for entry in entries if self.add_contact(*entry))
+        self.flush()
+        return added
+    
     def edit_contact(self, name, phone_number=None, email=None, address=None):
         """Edit an existing contact"""
         # Find contact case-insensitively
-        contact_key = None
-        for key in self.contacts:
-            if key.lower() == name.lower():
-                contact_key = key
-                break
+        contact_key = self._ci_index.get(name.lower())
         
         if contact_key is None:
             print(f"Contact '{name}' not found!")
@@ -75,49 +259,44 @@ class ContactBook:
         if address:
             self.contacts[contact_key]["address"] = address
         
-        self.save_contacts()
-        print(f"Contact '{contact_key}' updated successfully!")
+        self._index_contact(contact_key)
+        self._changed[contact_key] = None
+        if self.verbose:
+            print(f"Contact '{contact_key}' updated successfully!")
         return True
     
     def search_contact(self, query):
         """Search for contacts by name, phone, or email"""
-        results = []
+        contacts = self.contacts  # Loads the file and search haystacks if needed
         query_lower = query.lower()
         
-        # Search through all contacts
-        for name, details in self.contacts.items():
-            # Match by name (case-insensitive), phone (exact), or email (case-insensitive)
-            if (query_lower in name.lower() or 
-                query in details.get("phone", "") or
-                query_lower in details.get("email", "").lower()):
-                results.append((name, details))
-        
-        return results
+        # Match by name, phone, or email (case-insensitive) with one substring
+        # scan of each contact's precomputed haystack
+        return [
+            (name, contacts[name])
+            for name, haystack in self._haystack.items()
+            if query_lower in haystack
+        ]
     
     def delete_contact(self, name):
         """Delete a contact"""
-        contact_key = None
-        for key in self.contacts:
-            if key.lower() == name.lower():
-                contact_key = key
-                break
+        contact_key = self._ci_index.get(name.lower())
         
         if contact_key is None:
             print(f"Contact '{name}' not found!")
             return False
         
         del self.contacts[contact_key]
-        self.save_contacts()
-        print(f"Contact '{contact_key}' deleted successfully!")
+        del self._ci_index[contact_key.lower()]
+        del self._haystack[contact_key]
+        self._changed[contact_key] = None
+        if self.verbose:
+            print(f"Contact '{contact_key}' deleted successfully!")
         return True
     
     def display_contact(self, name):
         """Display details of a specific contact"""
-        contact_key = None
-        for key in self.contacts:
-            if key.lower() == name.lower():
-                contact_key = key
-                break
+        contact_key = self._ci_index.get(name.lower())
         
         if contact_key is None:
             print(f"Contact '{name}' not found!")
@@ -140,24 +319,35 @@ class ContactBook:
             return
         
         print(f"\n{'='*70}")
-        print(f"{'Name':<20} {'Phone':<15} {'Email':<25}")
+        print(self._ROW_FORMAT % ("Name", "Phone", "Email"))
         print(f"{'='*70}")
         
-        for name, details in self.contacts.items():
-            phone = details.get("phone", "N/A")
-            email = details.get("email", "N/A")
-            print(f"{name:<20} {phone:<15} {email:<25}")
+        # Build all rows first and print them with a single write
+        row_format = self._ROW_FORMAT
+        lines = [
+            row_format % (name, details.get("phone", "N/A"), details.get("email", "N/A"))
+            for name, details in self.contacts.items()
+        ]
+        print("\n".join(lines))
         
         print(f"{'='*70}\n")
     
     @staticmethod
     def validate_phone(phone_number):
         """Validate phone number - must have at least 10 digits"""
-        # Remove separators (-, spaces, parentheses)
-        clean_phone = phone_number.replace("-", "").replace(" ", "").replace("(", "").replace(")", "")
-        # Count digits and ensure minimum of 10
-        digits = sum(1 for c in clean_phone if c.isdigit())
-        return digits >= 10
+        # Count digits and ensure minimum of 10; separators are simply not counted
+        return len(_DIGIT_RE.findall(phone_number)) >= 10
+
+
+# Read one line of user input
+def prompt(message):
+    """Show a prompt and return the stripped line typed in reply"""
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError  # Same as input() when stdin is closed
+    return line.strip()
 
 
 # Display menu options
@@ -176,6 +366,98 @@ def display_menu():
     print("="*50)
 
 
+# Menu handlers - each takes the book and returns True to exit the app
+
+# Option 1: Add new contact
+def _add(book):
+    """Prompt for contact details and add the contact"""
+    name = prompt("Enter contact name: ")
+    phone = prompt("Enter phone number: ")
+    email = prompt("Enter email (optional): ")
+    address = prompt("Enter address (optional): ")
+    book.add_contact(name, phone, email, address)
+
+
+# Option 2: Search for contact
+def _search(book):
+    """Prompt for a query and print matching contacts"""
+    query = prompt("Enter name, phone number, or email to search: ")
+    results = book.search_contact(query)
+    
+    if results:
+        print(f"\n{'='*70}")
+        print(f"Found {len(results)} result(s):")
+        print(f"{'='*70}")
+        for name, details in results:
+            print(f"\nName: {name}")
+            print(f"Phone: {details.get('phone', 'N/A')}")
+            print(f"Email: {details.get('email', 'N/A')}")
+            print(f"Address: {details.get('address', 'N/A')}")
+        print(f"{'='*70}\n")
+    else:
+        print(f"No contacts found matching '{query}'!")
+
+
+# Option 3: Edit existing contact
+def _edit(book):
+    """Prompt for a contact and the fields to change"""
+    name = prompt("Enter contact name to edit: ")
+    print("Leave fields empty to skip editing")
+    phone = prompt("Enter new phone number (optional): ")
+    email = prompt("Enter new email (optional): ")
+    address = prompt("Enter new address (optional): ")
+    book.edit_contact(name, phone or None, email or None, address or None)
+
+
+# Option 4: Delete contact
+def _delete(book):
+    """Prompt for a contact and delete it after confirmation"""
+    name = prompt("Enter contact name to delete: ")
+    confirm = prompt(f"Are you sure you want to delete '{name}'? (yes/no): ").lower()
+    if confirm == "yes":
+        book.delete_contact(name)
+    else:
+        print("Deletion cancelled.")
+
+
+# Option 5: Display single contact details
+def _display(book):
+    """Prompt for a contact and print its details"""
+    name = prompt("Enter contact name to display: ")
+    book.display_contact(name)
+
+
+# Option 6: List all contacts
+def _list_all(book):
+    """Print all contacts"""
+    book.list_all_contacts()
+
+
+# Option 7: Exit application
+def _exit(book):
+    """Say goodbye and signal the main loop to stop"""
+    print("Thank you for using Contact Book! Goodbye!")
+    return True
+
+
+# Invalid option
+def _invalid(book):
+    """Report an unknown menu choice"""
+    print("Invalid choice! Please try again.")
+
+
+# Menu choice -> handler
+MENU_HANDLERS = {
+    "1": _add,
+    "2": _search,
+    "3": _edit,
+    "4": _delete,
+    "5": _display,
+    "6": _list_all,
+    "7": _exit,
+}
+
+
 # Main application function
 def main():
     """Main application loop - handles user interactions"""
@@ -184,69 +466,17 @@ def main():
     # Continuous loop for user menu
     while True:
         display_menu()
-        choice = input("Enter your choice (1-7): ").strip()  # Get user input
-        
-        # Option 1: Add new contact
-        if choice == "1":
-            name = input("Enter contact name: ").strip()
-            phone = input("Enter phone number: ").strip()
-            email = input("Enter email (optional): ").strip()
-            address = input("Enter address (optional): ").strip()
-            book.add_contact(name, phone, email, address)
-        
-        # Option 2: Search for contact
-        elif choice == "2":
-            query = input("Enter name, phone number, or email to search: ").strip()
-            results = book.search_contact(query)
-            
-            if results:
-                print(f"\n{'='*70}")
-                print(f"Found {len(results)} result(s):")
-                print(f"{'='*70}")
-                for name, details in results:
-                    print(f"\nName: {name}")
-                    print(f"Phone: {details.get('phone', 'N/A')}")
-                    print(f"Email: {details.get('email', 'N/A')}")
-                    print(f"Address: {details.get('address', 'N/A')}")
-                print(f"{'='*70}\n")
-            else:
-                print(f"No contacts found matching '{query}'!")
-        
-        # Option 3: Edit existing contact
-        elif choice == "3":
-            name = input("Enter contact name to edit: ").strip()
-            print("Leave fields empty to skip editing")
-            phone = input("Enter new phone number (optional): ").strip()
-            email = input("Enter new email (optional): ").strip()
-            address = input("Enter new address (optional): ").strip()
-            book.edit_contact(name, phone or None, email or None, address or None)
-        
-        # Option 4: Delete contact
-        elif choice == "4":
-            name = input("Enter contact name to delete: ").strip()
-            confirm = input(f"Are you sure you want to delete '{name}'? (yes/no): ").strip().lower()
-            if confirm == "yes":
-                book.delete_contact(name)
-            else:
-                print("Deletion cancelled.")
+        choice = prompt("Enter your choice (1-7): ")  # Get user input
         
-        # Option 5: Display single contact details
-        elif choice == "5":
-            name = input("Enter contact name to display: ").strip()
-            book.display_contact(name)
+        done = MENU_HANDLERS.get(choice, _invalid)(book)
         
-        # Option 6: List all contacts
-        elif choice == "6":
-            book.list_all_contacts()
-        
-        # Option 7: Exit application
-        elif choice == "7":
-            print("Thank you for using Contact Book! Goodbye!")
+        # Write any changes made by this action in one go
+        book.flush()
+        if done:
             break
-        
-        # Invalid option
-        else:
-            print("Invalid choice! Please try again.")
+    
+    # Leave a single up-to-date contacts file behind on a clean exit
+    book.compact()
 
 
 # Run application if executed directly